@@ -0,0 +1,155 @@
+# Buycoin Python SDK
+# Copyright 2021 Iyanuoluwa Ajao
+# See LICENCE for details.
+
+"""
+Throughput of the HTTP/1.1 ``requests`` path against the HTTP/2 transports.
+
+Runs a local stand-in server that answers every call with a canned ``getMarketBook`` payload after a short delay,
+then measures calls per second at 1, 10 and 100 concurrent calls. Every path posts the same ``GET_MARKET_BOOK``
+document and is sent the same gzip-compressed response, so the numbers compare connection handling only.
+
+Needs the packages in ``requirements-bench.txt``. Run it from a checkout; the repository root is put on the path::
+
+    pip install -r requirements-bench.txt
+    python benchmarks/http2_transport.py
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from graphql import print_ast
+from hypercorn.asyncio import serve
+from hypercorn.config import Config
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from buycoins.queries import GET_MARKET_BOOK  # noqa: E402
+from buycoins.transport import AsyncHTTP2Transport, HTTP2Transport  # noqa: E402
+
+
+HOST = '127.0.0.1'
+PORT = 8765
+URL = f'http://{HOST}:{PORT}/api'
+LATENCY = 0.02
+ORDERS = 200
+CONCURRENCY = [1, 10, 100]
+CALLS_PER_WORKER = 5
+
+NODE = {
+    'id': 'UG9zdExpbWl0T3JkZXItOWI3ZDQ2ZDEtMmFkNC00ZDBhLWJkYzAtNjZkMjg2YmI0ZjEx',
+    'cryptocurrency': 'bitcoin',
+    'coinAmount': '0.01',
+    'side': 'sell',
+    'status': 'active',
+    'createdAt': 1612262400,
+    'pricePerCoin': '18000000.0',
+    'priceType': 'static',
+    'staticPrice': '18000000.0',
+    'dynamicExchangeRate': None,
+}
+BODY = json.dumps({'data': {'getMarketBook': {
+    'dynamicPriceExpiry': 1612262400,
+    'orders': {'edges': [{'node': NODE} for _ in range(ORDERS)]},
+}}}).encode('utf-8')
+GZIP_BODY = gzip.compress(BODY)
+QUERY = print_ast(GET_MARKET_BOOK)
+
+
+async def app(scope, receive, send):
+    if scope['type'] != 'http':
+        return
+
+    more_body = True
+    while more_body:
+        message = await receive()
+        more_body = message.get('more_body', False)
+
+    await asyncio.sleep(LATENCY)
+
+    headers = [(b'content-type', b'application/json')]
+    body = BODY
+    accept_encoding = dict(scope['headers']).get(b'accept-encoding', b'')
+    if b'gzip' in accept_encoding:
+        headers.append((b'content-encoding', b'gzip'))
+        body = GZIP_BODY
+
+    await send({'type': 'http.response.start', 'status': 200, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def start_server():
+    config = Config()
+    config.bind = [f'{HOST}:{PORT}']
+    config.loglevel = 'ERROR'
+    # A shutdown trigger that never fires stops hypercorn from installing signal handlers outside the main thread.
+    server = serve(app, config, shutdown_trigger=lambda: asyncio.Future())
+    thread = threading.Thread(target=asyncio.run, args=(server,), daemon=True)
+    thread.start()
+    time.sleep(1)
+
+
+def run_threads(call, concurrency):
+    def worker():
+        for _ in range(CALLS_PER_WORKER):
+            call()
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    return concurrency * CALLS_PER_WORKER / (time.perf_counter() - start)
+
+
+def requests_call():
+    # A new connection per call, like ``API.request``.
+    response = requests.post(URL, json={'query': QUERY, 'variables': None})
+    response.json()
+
+
+async def run_async(concurrency_levels):
+    # Plain http:// URLs need HTTP/2 prior knowledge; against the real API it is negotiated over TLS.
+    transport = AsyncHTTP2Transport(URL, headers={}, http1=False)
+
+    async def worker():
+        for _ in range(CALLS_PER_WORKER):
+            await transport.execute(GET_MARKET_BOOK)
+
+    results = []
+    for concurrency in concurrency_levels:
+        start = time.perf_counter()
+        await asyncio.gather(*[worker() for _ in range(concurrency)])
+        results.append(concurrency * CALLS_PER_WORKER / (time.perf_counter() - start))
+
+    await transport.close()
+    return results
+
+
+def main():
+    start_server()
+
+    transport = HTTP2Transport(URL, headers={}, http1=False)
+    for name, response in [('requests', requests.post(URL, json={})), ('httpx', transport.client.post(URL, json={}))]:
+        version = getattr(response, 'http_version', 'HTTP/1.1')
+        print(f'{name}: {version}, Content-Encoding: {response.headers.get("content-encoding")}')
+    print(f'response body: {len(BODY)} bytes, {len(GZIP_BODY)} bytes gzipped on both paths')
+
+    baseline = [run_threads(requests_call, concurrency) for concurrency in CONCURRENCY]
+    sync = [run_threads(lambda: transport.execute(GET_MARKET_BOOK), concurrency) for concurrency in CONCURRENCY]
+    async_ = asyncio.run(run_async(CONCURRENCY))
+    transport.close()
+
+    print(f'{"concurrency":>12} {"requests":>12} {"http2 sync":>12} {"http2 async":>12}  (calls/s)')
+    for row in zip(CONCURRENCY, baseline, sync, async_):
+        print('{:>12} {:>12.1f} {:>12.1f} {:>12.1f}'.format(*row))
+
+
+if __name__ == '__main__':
+    main()
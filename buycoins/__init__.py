@@ -1,18 +1,15 @@
-from .decorators import RateLimit
-
-limits = RateLimit
-
-
 __all__ = [
     'api',
     'auth',
-    'client',
-    'config',
-    'decorators',
     'exceptions',
-    'utils',
-    'http',
-    'limits',
+    'ledger',
+    'mutations',
+    'projection',
+    'queries',
+    'quoter',
+    'transport',
+    'validators',
+    'webhook',
 ]
 
 __version__ = ''
@@ -2,18 +2,22 @@
 # Copyright 2021 Iyanuoluwa Ajao
 # See LICENCE for details.
 
+import asyncio
 import base64
 import logging
 
-from ratelimit import limits, sleep_and_retry
+from ratelimit import RateLimitException, limits, sleep_and_retry
 from gql import Client
 from gql.transport.requests import RequestsHTTPTransport
 
 from buycoins.exceptions import BuycoinsException
 from buycoins.mutations import (CREATE_ADDRESS, CREATE_DEPOSIT_ACCOUNT,
                                 POST_LIMIT_ORDER, POST_MARKET_ORDER, BUY, SELL, SEND)
+from buycoins.projection import project
 from buycoins.queries import (CURRENT_BUYCOINS_PRICE, GET_ORDERS, GET_MARKET_BOOK,
                               GET_PRICES, GET_ESTIMATED_NETWORK_FEE, GET_BALANCES)
+from buycoins.transport import AsyncHTTP2Transport, HTTP2Transport
+from buycoins.validators import ENUMS, get_validator
 
 
 base_url = 'https://backend.buycoins.tech/api'
@@ -21,22 +25,34 @@ base_url = 'https://backend.buycoins.tech/api'
 MAX_CALLS = 300
 ONE_MINUTE = 60
 
-ORDER_SIDE = ['buy', 'sell']
-CRYPTOCURRENCIES = ['bitcoin', 'ethereum', 'litecoin', 'naira_token', 'usd_coin', 'usd_tether']
-STATUS = ['open', 'completed']
-
 log = logging.getLogger(__name__)
 
 
+@limits(calls=MAX_CALLS, period=ONE_MINUTE)
+def _check_rate_limit():
+    """One budget of ``MAX_CALLS`` per ``ONE_MINUTE``, shared by every :class:`API` and :class:`AsyncAPI`."""
+
+
+_wait_for_rate_limit = sleep_and_retry(_check_rate_limit)
+
+
 class API:
     """Buycoin API"""
 
-    def __init__(self, public_key, secret_key):
+    def __init__(self, public_key, secret_key, http2=False):
         """
         Constructor for the API Class
+
+        :param public_key: (``str``)
+        :param secret_key: (``str``)
+        :param http2: (``bool``) Send requests over one multiplexed HTTP/2 connection. Requires ``httpx``.
         """
         self.public_key = public_key
         self.secret_key = secret_key
+        self.schema = None
+        self.transport = None
+        if http2:
+            self.transport = HTTP2Transport(base_url, headers=self._process_headers())
 
     def _process_headers(self):
         credentials = (self.public_key + ':' + self.secret_key).encode('utf-8')
@@ -46,9 +62,18 @@ class API:
         }
         return headers
 
-    @sleep_and_retry
-    @limits(calls=MAX_CALLS, period=ONE_MINUTE)
-    def request(self, query, params=None):
+    def request(self, query, params=None, fields=None):
+        """
+        Validate ``params`` against the variables declared by ``query`` and execute it.
+
+        Validation happens before the rate limiter so rejected requests never use the rate budget. Once a schema
+        has been fetched, its enum values are used.
+
+        :param query: (``DocumentNode``) A document from :mod:`buycoins.queries` or :mod:`buycoins.mutations`.
+        :param params: (``dict``, optional) The variable values.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
+        :return:
+        """
 
         # Throw an error if auth is required and there is no authentication
         # if require_auth and not self.auth_handler:
@@ -57,26 +82,35 @@ class API:
         if params is None:
             params = {}
 
-        # for key, value in kwargs.items():
-        #     if value is None:
-        #         continue
-        #     if key in params:
-        #         raise BuycoinsException(f'Multiple values for parameter {key} supplied!')
-        #     params[key] = value
+        variables = get_validator(query)(params, self.schema)
+        return self._execute(project(query, fields), variables)
+
+    def _execute(self, query, variables):
+        _wait_for_rate_limit()
+        if self.transport is not None:
+            return self.transport.execute(query, variables)
 
         transport = RequestsHTTPTransport(url=base_url, headers=self._process_headers())
-        client = Client(transport=transport, fetch_schema_from_transport=True)
-        result = client.execute(query, variable_values=params)
+        # The schema is fetched once and then reused, both here and by the validators.
+        client = Client(transport=transport, schema=self.schema, fetch_schema_from_transport=self.schema is None)
+        result = client.execute(query, variable_values=variables)
+        self.schema = client.schema
 
         return result
 
-    def current_buycoin_price(self, side, mode='standard', cryptocurrency='bitcoin'):
+    def close(self):
+        """Close the HTTP/2 connection, if one is open."""
+        if self.transport is not None:
+            self.transport.close()
+
+    def current_buycoin_price(self, side, mode='standard', cryptocurrency='bitcoin', fields=None):
         """
         Current Buycoin Price.
 
         :param side:
         :param mode: (``str``) Default is `standard`
         :param cryptocurrency: (``str``) The default is `bitcoin`. The cryptocurrency you want to trade.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -86,43 +120,37 @@ class API:
         Reference::
 
         """
-        if side not in ORDER_SIDE:
-            raise BuycoinsException(f"The 'side' parameter has a wrong value '{side}'.")
-
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
+        if mode != 'standard':
+            raise BuycoinsException(f"The 'mode' parameter has a wrong value '{mode}'.")
 
-        params = {'side': side, 'mode': mode, 'cryptocurrency': cryptocurrency}
-        return self.request(query=CURRENT_BUYCOINS_PRICE, params=params)
+        params = {'side': side, 'cryptocurrency': cryptocurrency}
+        return self.request(query=CURRENT_BUYCOINS_PRICE, params=params, fields=fields)
 
-    def get_orders(self, status=None):
+    def get_orders(self, status, fields=None):
         """
-        Retrieve all your orders.
+        Retrieve your orders.
 
-        :param status: (``str``, optional) The status of orders to fetch, either `open` or `completed`. You can fetch all orders too.
+        :param status: (``str``) The status of orders to fetch, either `open` or `completed`.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
-            >>> api.get_orders()
             >>> api.get_orders('open')
             >>> api.get_orders('completed')
 
         Reference::
             https://developers.buycoins.africa/p2p/get-orders
         """
-        if status is None:
-            return self.request(query=GET_ORDERS)
-        elif status not in STATUS:
-            raise BuycoinsException(f"The 'status' parameter has a wrong value '{status}'.")
-
         params = {'status': status}
-        return self.request(query=GET_ORDERS, params=params)
+        return self.request(query=GET_ORDERS, params=params, fields=fields)
 
-    def get_market_book(self, status=None):
+    def get_market_book(self, status=None, fields=None):
         """
         Retrieve the market book.
 
-        :param status: (``str``, optional) The status of orders to fetch, either `open` or `completed`. You can fetch all orders too.
+        :param status: (``str``, optional) Either `open` or `completed`. The market book query does not filter by
+            status, so this is only checked locally.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -133,19 +161,17 @@ class API:
         Reference::
             https://developers.buycoins.africa/p2p/get-market-book
         """
-        if status is None:
-            return self.request(query=GET_MARKET_BOOK)
-        elif status not in STATUS:
+        if status is not None and status not in ENUMS['GetOrdersStatus']:
             raise BuycoinsException(f"The 'status' parameter has a wrong value '{status}'.")
 
-        params = {'status': status}
-        return self.request(query=GET_MARKET_BOOK, params=params)
+        return self.request(query=GET_MARKET_BOOK, fields=fields)
 
-    def get_prices(self, cryptocurrency=None):
+    def get_prices(self, cryptocurrency=None, fields=None):
         """
         Get all active prices or get a singular cryptocurrency prices.
 
         :param cryptocurrency: (``str``, optional). Type of cryptocurrency.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -154,20 +180,16 @@ class API:
             >>> api.get_prices('litecoin')
 
         """
-        if cryptocurrency is None:
-            return self.request(query=GET_PRICES)
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
-
         params = {'cryptocurrency': cryptocurrency}
-        return self.request(query=GET_PRICES, params=params)
+        return self.request(query=GET_PRICES, params=params, fields=fields)
 
-    def get_estimated_network_fee(self, amount, cryptocurrency='bitcoin'):
+    def get_estimated_network_fee(self, amount, cryptocurrency='bitcoin', fields=None):
         """
         Get estimated network fees before sending.
 
-        :param amount: (``float``) Amount to send to an external address.
+        :param amount: (``float``, ``int``, ``Decimal`` or ``str``) Amount to send to an external address.
         :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -176,22 +198,17 @@ class API:
         Reference::
             https://developers.buycoins.africa/sending/network-fees
         """
-        if not isinstance(amount, float):
-            raise BuycoinsException(f"The 'amount' parameter has a wrong value '{amount}'.")
-
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
-
         params = {'amount': amount, 'cryptocurrency': cryptocurrency}
-        return self.request(query=GET_ESTIMATED_NETWORK_FEE, params=params)
+        return self.request(query=GET_ESTIMATED_NETWORK_FEE, params=params, fields=fields)
 
-    def get_balances(self, cryptocurrency=None):
+    def get_balances(self, cryptocurrency=None, fields=None):
         """
         Check Cryptocurrency account balances with the API.
 
         This will return all your balances or the balance of a particular cryptocurrency argument passed in.
 
         :param cryptocurrency: (``str``, optional). Type of cryptocurrency.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -201,19 +218,15 @@ class API:
         Reference::
             https://developers.buycoins.africa/sending/account-balances
         """
-        if cryptocurrency is None:
-            return self.request(query=GET_BALANCES)
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
-
         params = {'cryptocurrency': cryptocurrency}
-        return self.request(query=GET_BALANCES, params=params)
+        return self.request(query=GET_BALANCES, params=params, fields=fields)
 
-    def create_deposit_account(self, account_name):
+    def create_deposit_account(self, account_name, fields=None):
         """
         Creating account to receive Naira.
 
         :param account_name: (``str``). Account name.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -223,19 +236,20 @@ class API:
             https://developers.buycoins.africa/naira-token-account/create-virtual-deposit-account
         """
         params = {'accountName': account_name}
-        return self.request(query=CREATE_DEPOSIT_ACCOUNT, params=params)
+        return self.request(query=CREATE_DEPOSIT_ACCOUNT, params=params, fields=fields)
 
     def post_limit_order(self, order_side, coin_amount, price_type, cryptocurrency='bitcoin', static_price=None,
-                         dynamic_exchange_rate=None):
+                         dynamic_exchange_rate=None, fields=None):
         """
         Place a limit order.
 
-        :param order_side:
+        :param order_side: (``str``). The order side either buy or sell.
         :param coin_amount: (``float``). The amount of coin.
-        :param price_type:
+        :param price_type: (``str``). Either `static` or `dynamic`.
         :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
-        :param static_price: (````, optional)
-        :param dynamic_exchange_rate: (````, optional)
+        :param static_price: (``float``, optional) Required when price_type is `static`.
+        :param dynamic_exchange_rate: (``float``, optional) Required when price_type is `dynamic`.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -245,33 +259,25 @@ class API:
             https://developers.buycoins.africa/p2p/post-limit-order
         """
 
-        if order_side not in ORDER_SIDE:
-            raise BuycoinsException(f"The value for side parameter '{order_side}' is not correct")
-
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
-
-        # if price_type not in ['static', 'dynamic']:
-        #     raise BuycoinsException(f'The value for side parameter {price_type} is not correct')
-
-        if price_type is 'static' and static_price is None:
+        if price_type == 'static' and static_price is None:
             raise BuycoinsException(f'When price_type is static, static_price is required.')
 
-        if price_type is 'dynamic' and dynamic_exchange_rate is None:
+        if price_type == 'dynamic' and dynamic_exchange_rate is None:
             raise BuycoinsException(f'When price_type is dynamic, dynamic_exchange_rate is required.')
 
         params = {'coinAmount': coin_amount, 'orderSide': order_side, 'priceType': price_type,
                   'cryptocurrency': cryptocurrency, 'staticPrice': static_price,
-                  'dynamic_exchange_rate': dynamic_exchange_rate}
-        return self.request(query=POST_LIMIT_ORDER, params=params)
+                  'dynamicExchangeRate': dynamic_exchange_rate}
+        return self.request(query=POST_LIMIT_ORDER, params=params, fields=fields)
 
-    def post_market_order(self, coin_amount, order_side, cryptocurrency='bitcoin'):
+    def post_market_order(self, coin_amount, order_side, cryptocurrency='bitcoin', fields=None):
         """
         Place a market order.
 
         :param coin_amount: (``float``). The amount of coin.
         :param order_side: (``str``). The order side either buy or sell.
         :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -280,19 +286,10 @@ class API:
         Reference::
             https://developers.buycoins.africa/p2p/post-market-order
         """
-        if not isinstance(coin_amount, float):
-            raise BuycoinsException(f"The 'amount' parameter has a wrong value '{coin_amount}'. ")
-
-        if order_side not in ORDER_SIDE:
-            raise BuycoinsException(f'The value for side parameter {order_side} is not correct')
-
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
-
         params = {'coinAmount': coin_amount, 'orderSide': order_side, 'cryptocurrency': cryptocurrency}
-        return self.request(query=POST_MARKET_ORDER, params=params)
+        return self.request(query=POST_MARKET_ORDER, params=params, fields=fields)
 
-    def buy(self, price, coin_amount, cryptocurrency='bitcoin'):
+    def buy(self, price, coin_amount, cryptocurrency='bitcoin', fields=None):
         """
         Buying cryptocurrency with the API.
 
@@ -304,26 +301,22 @@ class API:
         :param price: The ``id`` of an active price.
         :param coin_amount: (``float``). Amount of coin to buy.
         :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         :reference: https://developers.buycoins.africa/placing-orders/buy
         """
-        if not isinstance(coin_amount, float):
-            raise BuycoinsException(f"The 'amount' parameter has a wrong value '{coin_amount}'. ")
-
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
-
         params = {'price': price, 'coin_amount': coin_amount, 'cryptocurrency': cryptocurrency}
-        return self.request(query=BUY, params=params)
+        return self.request(query=BUY, params=params, fields=fields)
 
-    def sell(self, price, coin_amount, cryptocurrency='bitcoin'):
+    def sell(self, price, coin_amount, cryptocurrency='bitcoin', fields=None):
         """
         Selling cryptocurrency with the API.
 
         :param price: (``str``). The ``id`` of an active price.
         :param coin_amount: (``float``). Amount of coin to sell.
         :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -334,22 +327,17 @@ class API:
         Reference::
             https://developers.buycoins.africa/placing-orders/sell
         """
-        if not isinstance(coin_amount, float):
-            raise BuycoinsException(f"The 'amount' parameter has a wrong value '{coin_amount}'. ")
-
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
-
         params = {'price': price, 'coin_amount': coin_amount, 'cryptocurrency': cryptocurrency}
-        return self.request(query=SELL, params=params)
+        return self.request(query=SELL, params=params, fields=fields)
 
-    def send(self, amount, address, cryptocurrency='bitcoin'):
+    def send(self, amount, address, cryptocurrency='bitcoin', fields=None):
         """
         Send Cryptocurrency with the API.
 
         :param amount: (``float``). Amount of coin to send.
         :param address: (``str``). On-chain address.
         :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -359,20 +347,15 @@ class API:
             https://developers.buycoins.africa/sending/send
 
         """
-        if not isinstance(amount, float):
-            raise BuycoinsException(f"The 'amount' parameter has a wrong value '{amount}'. ")
-
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
-
         params = {'amount': amount, 'address': address, 'cryptocurrency': cryptocurrency}
-        return self.request(query=SEND, params=params)
+        return self.request(query=SEND, params=params, fields=fields)
 
-    def create_address(self, cryptocurrency='bitcoin'):
+    def create_address(self, cryptocurrency='bitcoin', fields=None):
         """
         create an address on BuyCoins to receive coins on the API.
 
         :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :param fields: (``list`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
         :return:
 
         Usage::
@@ -383,12 +366,42 @@ class API:
         Reference::
             https://developers.buycoins.africa/receiving/create-address
         """
+        params = {'cryptocurrency': cryptocurrency}
+        return self.request(query=CREATE_ADDRESS, params=params, fields=fields)
 
-        if cryptocurrency not in CRYPTOCURRENCIES:
-            raise BuycoinsException(f"The 'cryptocurrency' parameter has a wrong value '{cryptocurrency}'.")
+class AsyncAPI(API):
+    """
+    Buycoin API for asyncio, over one multiplexed HTTP/2 connection. Requires ``httpx``.
 
-        params = {'cryptocurrency': cryptocurrency}
-        return self.request(query=CREATE_ADDRESS, params=params)
+    Every method returns a coroutine. Variables are still validated when the method is called.
+
+    Usage::
+        >>> api = AsyncAPI(public_key, secret_key)
+        >>> prices, balances = await asyncio.gather(api.get_prices(), api.get_balances())
+        >>> await api.close()
+    """
+
+    def __init__(self, public_key, secret_key):
+        """
+        Constructor for the AsyncAPI Class
+        """
+        super().__init__(public_key, secret_key)
+        self.transport = AsyncHTTP2Transport(base_url, headers=self._process_headers())
+
+    def _execute(self, query, variables):
+        return self._execute_async(query, variables)
+
+    async def _execute_async(self, query, variables):
+        while True:
+            try:
+                _check_rate_limit()
+                break
+            except RateLimitException as exception:
+                await asyncio.sleep(exception.period_remaining)
+
+        return await self.transport.execute(query, variables)
+
+    async def close(self):
+        """Close the HTTP/2 connection."""
+        await self.transport.close()
 
-api = API('', '')
-api.create_deposit_account('')
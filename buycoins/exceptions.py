@@ -23,6 +23,22 @@ class BuycoinsException(Exception):
         return self.reason
 
 
+class ValidationException(BuycoinsException):
+    """ Class that handles variables rejected before a request is sent"""
+
+    def __init__(self, reason, variable=None, value=None):
+        """
+        Constructor for the ValidationException Class
+
+        :param reason:
+        :param variable: The name of the offending variable.
+        :param value: The rejected value.
+        """
+        self.variable = variable
+        self.value = value
+        super().__init__(reason)
+
+
 class RateLimitException(BuycoinsException):
 
     def __init__(self, reason, period_remaining):
@@ -0,0 +1,287 @@
+# Buycoin Python SDK
+# Copyright 2021 Iyanuoluwa Ajao
+# See LICENCE for details.
+
+"""
+A local balance ledger kept up to date from mutation results and webhook events.
+
+The :class:`BalanceLedger` is seeded from one ``getBalances`` call and then applies the results of your own
+``buy``/``sell``/``send``/``postLimitOrder``/``postMarketOrder`` mutations and verified webhook events, so balance
+checks do not need a round trip. It reconciles against the server every ``reconcile_interval`` seconds or when it
+detects drift.
+
+>>> ledger = BalanceLedger(api)
+>>> ledger.apply_result(api.send(0.01, '1MmyYvSEYLCPm45Ps6vQin1heGBv3UpNbf', 'bitcoin'))
+>>> ledger.balance('bitcoin')
+"""
+
+import threading
+import time
+from collections import deque
+from decimal import Decimal, InvalidOperation
+
+from buycoins.webhook import parse_event
+
+
+RECONCILE_INTERVAL = 300
+NAIRA = 'naira_token'
+SEEN_EVENTS = 1024
+
+
+def _decimal(value):
+    if isinstance(value, float):
+        return Decimal(str(value))
+    return Decimal(value)
+
+
+def _number(value):
+    if value is None:
+        return None
+    try:
+        number = _decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+    return number if number.is_finite() else None
+
+
+class BalanceLedger:
+    """Local copy of your confirmed balances."""
+
+    def __init__(self, api, reconcile_interval=RECONCILE_INTERVAL):
+        """
+        Constructor for the BalanceLedger Class
+
+        :param api: (:class:`buycoins.api.API`)
+        :param reconcile_interval: (``int``) Seconds between reconciliations with ``getBalances``.
+        """
+        self.api = api
+        self.reconcile_interval = reconcile_interval
+        self.drifted = False
+        self._lock = threading.Lock()
+        self._reconcile_lock = threading.Lock()
+        self._seen = set()
+        self._seen_order = deque()
+        self._balances = {}
+        self._versions = {}
+        self._stale = frozenset()
+        self._reconciled_at = 0
+        self.reconcile()
+
+    def balance(self, cryptocurrency='bitcoin'):
+        """
+        Return the local balance of ``cryptocurrency``.
+
+        Reads do not take a lock; the balances are replaced as a whole on every update. A balance that trades have
+        changed in ways their results do not show, such as ``naira_token`` after a buy, is reconciled on its next
+        read.
+
+        :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :return: (``Decimal``)
+        """
+        if cryptocurrency in self._stale:
+            with self._reconcile_lock:
+                # Another thread may have reconciled while this one waited for the lock.
+                if cryptocurrency in self._stale:
+                    self._reconcile()
+        return self._balances.get(cryptocurrency, Decimal(0))
+
+    def balances(self):
+        """
+        Return a snapshot of all local balances.
+
+        :return: (``dict``)
+        """
+        return dict(self._balances)
+
+    def has(self, amount, cryptocurrency='bitcoin'):
+        """
+        Check whether the local balance covers ``amount``.
+
+        :param amount: (``Decimal``, ``float``, ``int`` or ``str``)
+        :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :return: (``bool``)
+        """
+        return self.balance(cryptocurrency) >= _decimal(amount)
+
+    def reconcile(self):
+        """
+        Replace the local balances with the server's using one ``getBalances`` call.
+
+        A balance the ledger changed while the call was in flight may or may not be included in the server's
+        snapshot, so that balance keeps its local value until the next reconciliation.
+
+        :return: (``dict``) The balances now held by the ledger.
+        """
+        with self._reconcile_lock:
+            return self._reconcile()
+
+    def _is_due(self):
+        return self.drifted or time.time() - self._reconciled_at >= self.reconcile_interval
+
+    def reconcile_if_needed(self):
+        """
+        Reconcile when drift was detected or ``reconcile_interval`` seconds have passed.
+
+        Only one reconciliation runs at a time; callers that find one in progress wait for it instead of starting
+        their own.
+
+        :return: (``bool``) Whether a reconciliation happened.
+        """
+        if not self._is_due():
+            return False
+        with self._reconcile_lock:
+            if not self._is_due():
+                return False
+            self._reconcile()
+            return True
+
+    def _reconcile(self):
+        with self._lock:
+            versions = dict(self._versions)
+
+        result = self.api.get_balances()
+        server = {balance['cryptocurrency']: _decimal(balance['confirmedBalance'])
+                  for balance in result['getBalances']}
+
+        with self._lock:
+            changed = {cryptocurrency for cryptocurrency, version in self._versions.items()
+                       if versions.get(cryptocurrency) != version}
+            balances = {cryptocurrency: balance for cryptocurrency, balance in server.items()
+                        if cryptocurrency not in changed}
+            for cryptocurrency in changed:
+                if cryptocurrency in self._balances:
+                    balances[cryptocurrency] = self._balances[cryptocurrency]
+            self._balances = balances
+            self._stale = frozenset(self._stale & changed)
+            self._reconciled_at = time.time()
+            self.drifted = False
+            return dict(balances)
+
+    # The methods below are called with ``_lock`` held.
+
+    def _drift(self):
+        self.drifted = True
+        return False
+
+    def _mark_stale(self, cryptocurrency):
+        # Bumping the version keeps the mark if a reconciliation is already in flight.
+        self._versions[cryptocurrency] = self._versions.get(cryptocurrency, 0) + 1
+        self._stale = self._stale | {cryptocurrency}
+
+    def _adjust(self, cryptocurrency, delta):
+        self._versions[cryptocurrency] = self._versions.get(cryptocurrency, 0) + 1
+        balances = dict(self._balances)
+        balance = balances.get(cryptocurrency, Decimal(0)) + delta
+        if balance < 0:
+            # The server knows about activity we have not seen.
+            self.drifted = True
+            balance = Decimal(0)
+        balances[cryptocurrency] = balance
+        self._balances = balances
+        return True
+
+    def _remember(self, key):
+        self._seen.add(key)
+        self._seen_order.append(key)
+        if len(self._seen_order) > SEEN_EVENTS:
+            self._seen.discard(self._seen_order.popleft())
+
+    def _apply_operation(self, operation, data):
+        cryptocurrency = data.get('cryptocurrency')
+        if cryptocurrency is None:
+            return self._drift()
+
+        if operation in ('buy', 'sell'):
+            coin_amount = _number(data.get('totalCoinAmount'))
+            if coin_amount is None:
+                return self._drift()
+            self._adjust(cryptocurrency, coin_amount if operation == 'buy' else -coin_amount)
+            # The naira spent or received is not part of the result.
+            self._mark_stale(NAIRA)
+            return True
+
+        if operation == 'send':
+            amount = _number(data.get('amount'))
+            fee = _number(data.get('fee') or 0)
+            if amount is None or fee is None or 'fee' not in data:
+                return self._drift()
+            return self._adjust(cryptocurrency, -(amount + fee))
+
+        if operation in ('postLimitOrder', 'postMarketOrder'):
+            coin_amount = _number(data.get('coinAmount'))
+            if data.get('side') == 'sell':
+                if coin_amount is None:
+                    return self._drift()
+                self._adjust(cryptocurrency, -coin_amount)
+            # Buy orders lock naira and sell orders pay naira out when they fill.
+            self._mark_stale(NAIRA)
+            return True
+
+        return self._drift()
+
+    def apply_result(self, result):
+        """
+        Apply the result of a ``buy``, ``sell``, ``send``, ``postLimitOrder`` or ``postMarketOrder`` mutation.
+
+        Buys add ``totalCoinAmount``, sells subtract it, sends subtract ``amount`` plus ``fee`` and sell orders
+        subtract the ``coinAmount`` they hold. Buys, sells and orders also change the naira balance in ways the result
+        does not show, so only that balance is reconciled, on its next read. A result missing a field the ledger
+        needs marks the whole ledger as drifted.
+
+        :param result: (``dict``) The value returned by the :class:`buycoins.api.API` method.
+        :return: (``dict``) ``result``, unchanged.
+        """
+        for operation, data in result.items():
+            if not data or data.get('status') == 'failed':
+                continue
+
+            with self._lock:
+                key = (operation, data.get('id'))
+                if key[1] is not None and key in self._seen:
+                    continue
+                if self._apply_operation(operation, data) and key[1] is not None:
+                    self._remember(key)
+
+        self.reconcile_if_needed()
+        return result
+
+    def apply_event(self, event):
+        """
+        Apply a webhook event payload, as returned by :func:`buycoins.webhook.parse_event`.
+
+        ``coins.incoming`` events are credited once their status is ``success``. Any other event marks the ledger as
+        drifted.
+
+        :param event: (``dict``) The webhook payload with ``event`` and ``data`` keys.
+        """
+        data = event.get('data') or {}
+        with self._lock:
+            key = ('event', data.get('id'))
+            if key[1] is not None and key in self._seen:
+                return
+
+            applied = False
+            if event.get('event') != 'coins.incoming':
+                self._drift()
+            elif data.get('status') == 'success':
+                amount = _number(data.get('amount'))
+                if data.get('cryptocurrency') is None or amount is None:
+                    self._drift()
+                else:
+                    applied = self._adjust(data['cryptocurrency'], amount)
+
+            # Only applied events are remembered, so a pending event does not hide its later success.
+            if applied and key[1] is not None:
+                self._remember(key)
+
+        self.reconcile_if_needed()
+
+    def apply_webhook(self, body, webhook_token, header_signature):
+        """
+        Verify a webhook request and apply its event.
+
+        :param body: (``bytes``) The raw request body.
+        :param webhook_token: (``str``) Your webhook token.
+        :param header_signature: (``str``) The value of the ``X-Webhook-Signature`` header.
+        """
+        self.apply_event(parse_event(body, webhook_token, header_signature))
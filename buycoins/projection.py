@@ -0,0 +1,143 @@
+# Buycoin Python SDK
+# Copyright 2021 Iyanuoluwa Ajao
+# See LICENCE for details.
+
+"""
+Field projection for the operations in :mod:`buycoins.queries` and :mod:`buycoins.mutations`.
+
+A projection keeps only the requested fields of the record an operation returns: the ``node`` of
+``getOrders``/``getMarketBook`` and the root field of every other operation. Trimmed documents are built once per
+field set and cached.
+
+>>> from buycoins.queries import GET_MARKET_BOOK
+>>> project(GET_MARKET_BOOK, ['pricePerCoin', 'coinAmount', 'side'])
+>>> project(GET_MARKET_BOOK, 'minimal')
+"""
+
+import copy
+import threading
+
+from graphql.language import FieldNode, SelectionSetNode
+
+from buycoins.exceptions import BuycoinsException
+
+
+FULL = 'full'
+MINIMAL = 'minimal'
+
+# The minimal presets keep every field that Quoter and BalanceLedger read.
+PRESETS = {
+    MINIMAL: {
+        'buycoinsPrices': ['id', 'buyPricePerCoin', 'sellPricePerCoin'],
+        'getOrders': ['id', 'side', 'status', 'coinAmount', 'pricePerCoin'],
+        'getMarketBook': ['pricePerCoin', 'coinAmount', 'side'],
+        'getPrices': ['id', 'cryptocurrency', 'buyPricePerCoin', 'sellPricePerCoin', 'minBuy', 'maxBuy', 'minSell',
+                      'maxSell', 'minCoinAmount', 'expiresAt'],
+        'getEstimatedNetworkFee': ['estimatedFee'],
+        'getBalances': ['cryptocurrency', 'confirmedBalance'],
+        'createDepositAccount': ['accountNumber', 'accountName', 'bankName'],
+        'postLimitOrder': ['id', 'cryptocurrency', 'coinAmount', 'side', 'status'],
+        'postMarketOrder': ['id', 'cryptocurrency', 'coinAmount', 'side', 'status'],
+        'buy': ['id', 'cryptocurrency', 'status', 'totalCoinAmount'],
+        'sell': ['id', 'cryptocurrency', 'status', 'totalCoinAmount'],
+        'send': ['id', 'cryptocurrency', 'amount', 'fee', 'status'],
+        'createAddress': ['cryptocurrency', 'address'],
+    },
+}
+
+# Fields followed from the root field down to the record of a connection.
+CONNECTION = ('orders', 'edges', 'node')
+
+MAX_PROJECTIONS = 256
+
+_projections = {}
+_projections_lock = threading.Lock()
+
+
+def _fields(selection_set):
+    return [selection for selection in selection_set.selections if isinstance(selection, FieldNode)]
+
+
+def _child(field, name):
+    for child in _fields(field.selection_set):
+        if child.name.value == name and child.selection_set is not None:
+            return child
+    return None
+
+
+def _record_path(root):
+    path = [root]
+    for name in CONNECTION:
+        child = _child(path[-1], name)
+        if child is None:
+            break
+        path.append(child)
+    return path
+
+
+def _with_selections(node, selections):
+    node = copy.copy(node)
+    node.selection_set = SelectionSetNode(selections=tuple(selections))
+    return node
+
+
+def _replace(selections, old, new):
+    return [new if selection is old else selection for selection in selections]
+
+
+def _trim(document, fields):
+    operation = document.definitions[0]
+    root = _fields(operation.selection_set)[0]
+    operation_name = root.name.value
+
+    path = _record_path(root)
+    record = path[-1]
+    available = {field.name.value: field for field in _fields(record.selection_set)}
+
+    if isinstance(fields, str):
+        if fields not in PRESETS:
+            raise BuycoinsException(f"The 'fields' parameter has a wrong value '{fields}'.")
+        # Presets are shared by documents of the same operation, which may not return every field.
+        fields = [name for name in PRESETS[fields][operation_name] if name in available]
+
+    selections = []
+    for name in fields:
+        if name not in available:
+            raise BuycoinsException(f"The field '{name}' is not returned by '{operation_name}'.")
+        selections.append(available[name])
+    if not selections:
+        raise BuycoinsException("The 'fields' parameter must not be empty.")
+
+    node = _with_selections(record, selections)
+    for parent in reversed(path[:-1]):
+        node = _with_selections(parent, _replace(parent.selection_set.selections, record, node))
+        record = parent
+
+    operation = _with_selections(operation, _replace(operation.selection_set.selections, root, node))
+    document = copy.copy(document)
+    document.definitions = (operation,) + tuple(document.definitions[1:])
+    return document
+
+
+def project(document, fields=None):
+    """
+    Return ``document`` trimmed to ``fields``.
+
+    :param document: (``DocumentNode``) A document from :mod:`buycoins.queries` or :mod:`buycoins.mutations`.
+    :param fields: (``list``, ``set`` or ``str``, optional) The fields to return, or a preset: `minimal` or `full`.
+        ``None`` and `full` return ``document`` unchanged. Fields are returned in alphabetical order.
+    :return: (``DocumentNode``)
+    """
+    if fields is None or fields == FULL:
+        return document
+
+    key = (id(document), fields if isinstance(fields, str) else tuple(sorted(set(fields))))
+    cached = _projections.get(key)
+    if cached is None:
+        cached = (document, _trim(document, key[1]))
+        with _projections_lock:
+            if len(_projections) >= MAX_PROJECTIONS:
+                _projections.pop(next(iter(_projections)))
+            # Keep a reference to the document so its id is not reused.
+            _projections[key] = cached
+    return cached[1]
@@ -2,8 +2,8 @@ from gql import gql
 
 CURRENT_BUYCOINS_PRICE = gql(
     """
-    query {
-      buycoinsPrices(side: buy, mode: standard, cryptocurrency: bitcoin){
+    query buycoinsPrices($side: OrderSide, $cryptocurrency: Cryptocurrency) {
+      buycoinsPrices(side: $side, mode: standard, cryptocurrency: $cryptocurrency){
         buyPricePerCoin
         cryptocurrency
         id
@@ -120,14 +120,17 @@ CURRENT_GET_PRICES = gql(
 
 GET_PRICES = gql(
     """
-    query{
-      getPrices{
+    query getPrices($cryptocurrency: Cryptocurrency) {
+      getPrices(cryptocurrency: $cryptocurrency) {
         id
         cryptocurrency
         sellPricePerCoin
         buyPricePerCoin
         minBuy
         maxBuy
+        minSell
+        maxSell
+        minCoinAmount
         expiresAt
       }
     }
@@ -159,8 +162,8 @@ GET_BALANCES_ = gql(
 
 GET_BALANCES = gql(
     """
-    query {
-        getBalances{
+    query getBalances($cryptocurrency: Cryptocurrency) {
+        getBalances(cryptocurrency: $cryptocurrency) {
             id
             cryptocurrency
             confirmedBalance
@@ -0,0 +1,210 @@
+# Buycoin Python SDK
+# Copyright 2021 Iyanuoluwa Ajao
+# See LICENCE for details.
+
+"""
+Local quotes from cached prices, limits and network fees.
+
+The :class:`Quoter` keeps the latest ``getPrices`` records and fee estimates so totals, limits and
+the price ``id`` for a trade are worked out locally instead of with a round trip before every order.
+
+>>> quoter = Quoter(api)
+>>> quote = quoter.quote_buy('0.002', 'bitcoin')
+>>> quote.total
+>>> quoter.buy('0.002', 'bitcoin')
+"""
+
+import threading
+import time
+from collections import namedtuple
+from decimal import Decimal, InvalidOperation
+
+from buycoins.exceptions import BuycoinsException
+
+
+EXPIRY_MARGIN = 5
+FEE_TTL = 60
+
+Quote = namedtuple('Quote', ['price_id', 'cryptocurrency', 'side', 'coin_amount', 'price_per_coin', 'total',
+                             'expires_at'])
+
+SendQuote = namedtuple('SendQuote', ['cryptocurrency', 'amount', 'fee', 'total'])
+
+
+def _decimal(value):
+    if value is None:
+        return None
+    try:
+        number = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+    except (InvalidOperation, TypeError, ValueError):
+        raise BuycoinsException(f"The amount '{value}' is not a number.")
+    if not number.is_finite():
+        raise BuycoinsException(f"The amount '{value}' is not a number.")
+    return number
+
+
+def _amount(value):
+    amount = _decimal(value)
+    if amount is None or amount <= 0:
+        raise BuycoinsException(f"The amount '{value}' must be positive.")
+    return amount
+
+
+class Quoter:
+    """Quotes trades from cached prices and fee estimates."""
+
+    def __init__(self, api, expiry_margin=EXPIRY_MARGIN, fee_ttl=FEE_TTL):
+        """
+        Constructor for the Quoter Class
+
+        :param api: (:class:`buycoins.api.API`)
+        :param expiry_margin: (``int``) Seconds before ``expiresAt`` when a price is no longer used.
+        :param fee_ttl: (``int``) Seconds a network fee estimate is reused for.
+        """
+        self.api = api
+        self.expiry_margin = expiry_margin
+        self.fee_ttl = fee_ttl
+        self.prices = {}
+        self.fees = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """
+        Fetch the active prices of every cryptocurrency with a single ``getPrices`` call.
+
+        :return: (``dict``) Price records keyed by cryptocurrency.
+        """
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self):
+        result = self.api.get_prices()
+        self.prices = {price['cryptocurrency']: price for price in result['getPrices']}
+        return self.prices
+
+    def _is_valid(self, price):
+        expires_at = price.get('expiresAt')
+        return expires_at is None or float(expires_at) - self.expiry_margin > time.time()
+
+    def price(self, cryptocurrency='bitcoin'):
+        """
+        Return a price record for ``cryptocurrency`` that is not about to expire.
+
+        The prices are only refreshed when the cached record is missing or about to expire.
+
+        :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :return: (``dict``)
+        """
+        price = self.prices.get(cryptocurrency)
+        if price is None or not self._is_valid(price):
+            with self._lock:
+                # Another thread may have refreshed the prices while this one waited for the lock.
+                price = self.prices.get(cryptocurrency)
+                if price is None or not self._is_valid(price):
+                    price = self._refresh().get(cryptocurrency)
+        if price is None:
+            raise BuycoinsException(f"There is no active price for '{cryptocurrency}'.")
+        return price
+
+    def _check_limits(self, coin_amount, price, minimum, maximum):
+        cryptocurrency = price['cryptocurrency']
+        min_coin_amount = _decimal(price.get('minCoinAmount'))
+        if min_coin_amount is not None and coin_amount < min_coin_amount:
+            raise BuycoinsException(f"The coin amount '{coin_amount}' is below the minimum "
+                                    f"'{min_coin_amount}' for '{cryptocurrency}'.")
+
+        minimum = _decimal(price.get(minimum))
+        if minimum is not None and coin_amount < minimum:
+            raise BuycoinsException(f"The coin amount '{coin_amount}' is below the minimum "
+                                    f"'{minimum}' for '{cryptocurrency}'.")
+
+        maximum = _decimal(price.get(maximum))
+        if maximum is not None and coin_amount > maximum:
+            raise BuycoinsException(f"The coin amount '{coin_amount}' is above the maximum "
+                                    f"'{maximum}' for '{cryptocurrency}'.")
+
+    def _quote(self, side, coin_amount, cryptocurrency):
+        coin_amount = _amount(coin_amount)
+        price = self.price(cryptocurrency)
+        if side == 'buy':
+            self._check_limits(coin_amount, price, 'minBuy', 'maxBuy')
+            price_per_coin = _decimal(price['buyPricePerCoin'])
+        else:
+            self._check_limits(coin_amount, price, 'minSell', 'maxSell')
+            price_per_coin = _decimal(price['sellPricePerCoin'])
+
+        return Quote(price_id=price['id'], cryptocurrency=cryptocurrency, side=side, coin_amount=coin_amount,
+                     price_per_coin=price_per_coin, total=coin_amount * price_per_coin,
+                     expires_at=price.get('expiresAt'))
+
+    def quote_buy(self, coin_amount, cryptocurrency='bitcoin'):
+        """
+        Quote buying ``coin_amount`` of ``cryptocurrency``.
+
+        :param coin_amount: (``Decimal``, ``float``, ``int`` or ``str``). Amount of coin to buy.
+        :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :return: (:class:`Quote`)
+        """
+        return self._quote('buy', coin_amount, cryptocurrency)
+
+    def quote_sell(self, coin_amount, cryptocurrency='bitcoin'):
+        """
+        Quote selling ``coin_amount`` of ``cryptocurrency``.
+
+        :param coin_amount: (``Decimal``, ``float``, ``int`` or ``str``). Amount of coin to sell.
+        :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :return: (:class:`Quote`)
+        """
+        return self._quote('sell', coin_amount, cryptocurrency)
+
+    def network_fee(self, amount, cryptocurrency='bitcoin'):
+        """
+        Return the estimated network fee for ``cryptocurrency``, reusing an estimate for ``fee_ttl`` seconds.
+
+        The network fee is assumed not to depend on the amount sent, so an estimate made for one amount is reused
+        for any amount of the same cryptocurrency.
+
+        :param amount: (``Decimal``, ``float``, ``int`` or ``str``). Amount to send.
+        :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :return: (``Decimal``)
+        """
+        cached = self.fees.get(cryptocurrency)
+        if cached is not None and cached[1] > time.time():
+            return cached[0]
+
+        result = self.api.get_estimated_network_fee(amount, cryptocurrency)
+        fee = _decimal(result['getEstimatedNetworkFee']['estimatedFee'])
+        self.fees[cryptocurrency] = (fee, time.time() + self.fee_ttl)
+        return fee
+
+    def quote_send(self, amount, cryptocurrency='bitcoin'):
+        """
+        Quote sending ``amount`` of ``cryptocurrency`` to an external address.
+
+        :param amount: (``Decimal``, ``float``, ``int`` or ``str``). Amount to send.
+        :param cryptocurrency: (``str``) The default is `bitcoin`. Type of cryptocurrency.
+        :return: (:class:`SendQuote`)
+        """
+        amount = _amount(amount)
+        fee = self.network_fee(amount, cryptocurrency)
+        return SendQuote(cryptocurrency=cryptocurrency, amount=amount, fee=fee, total=amount + fee)
+
+    def buy(self, coin_amount, cryptocurrency='bitcoin'):
+        """
+        Buy ``coin_amount`` of ``cryptocurrency`` at the cached price.
+
+        Usage::
+            >>> quoter.buy(0.002, 'bitcoin')
+        """
+        quote = self.quote_buy(coin_amount, cryptocurrency)
+        return self.api.buy(quote.price_id, quote.coin_amount, cryptocurrency)
+
+    def sell(self, coin_amount, cryptocurrency='bitcoin'):
+        """
+        Sell ``coin_amount`` of ``cryptocurrency`` at the cached price.
+
+        Usage::
+            >>> quoter.sell(0.002, 'bitcoin')
+        """
+        quote = self.quote_sell(coin_amount, cryptocurrency)
+        return self.api.sell(quote.price_id, quote.coin_amount, cryptocurrency)
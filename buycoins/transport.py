@@ -0,0 +1,167 @@
+# Buycoin Python SDK
+# Copyright 2021 Iyanuoluwa Ajao
+# See LICENCE for details.
+
+"""
+HTTP/2 transports built on ``httpx``.
+
+A single client is kept for the lifetime of the transport, so concurrent GraphQL calls are multiplexed over one
+HTTP/2 connection instead of opening a connection per request. Responses are negotiated with gzip, and with brotli
+when the ``brotli`` package is installed.
+
+A request that could not connect is retried once. A query is also retried once when the shared connection is closed
+under it, for example by a server ``GOAWAY``; a mutation is not, since the server may already have applied it.
+
+The transports are optional and need ``httpx`` with HTTP/2 support, as listed in ``requirements-http2.txt``::
+
+    pip install -r requirements-http2.txt
+"""
+
+import threading
+
+from graphql import OperationType, print_ast
+from gql.transport.exceptions import TransportProtocolError, TransportQueryError, TransportServerError
+
+from buycoins.exceptions import BuycoinsException
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+
+TIMEOUT = 30
+MAX_QUERIES = 512
+INSTALL_HINT = ("The HTTP/2 transport requires 'httpx[http2,brotli]': "
+                "pip install -r requirements-http2.txt or pip install 'httpx[http2,brotli]'")
+
+_queries = {}
+_queries_lock = threading.Lock()
+
+
+def _payload(document, variables):
+    cached = _queries.get(id(document))
+    if cached is None:
+        cached = (document, print_ast(document))
+        with _queries_lock:
+            if len(_queries) >= MAX_QUERIES:
+                _queries.pop(next(iter(_queries)))
+            # Keep a reference to the document so its id is not reused.
+            _queries[id(document)] = cached
+    return {'query': cached[1], 'variables': variables}
+
+
+def _result(response):
+    try:
+        result = response.json()
+    except ValueError:
+        result = None
+
+    if not isinstance(result, dict) or ('data' not in result and 'errors' not in result):
+        if response.status_code >= 400:
+            raise TransportServerError(f'{response.status_code} Server Error: {response.reason_phrase}',
+                                       response.status_code)
+        raise TransportProtocolError(f'Server did not return a GraphQL result: {response.text}')
+
+    if result.get('errors'):
+        raise TransportQueryError(str(result['errors'][0]), errors=result['errors'], data=result.get('data'),
+                                  extensions=result.get('extensions'))
+
+    return result['data']
+
+
+def _client(client_class, headers, kwargs):
+    kwargs.setdefault('http2', True)
+    kwargs.setdefault('timeout', TIMEOUT)
+    try:
+        return client_class(headers=headers, **kwargs)
+    except ImportError:
+        # httpx raises ImportError when http2=True and the h2 package is missing.
+        raise BuycoinsException(INSTALL_HINT)
+
+
+def _retryable(exception, document):
+    if isinstance(exception, httpx.ConnectError):
+        return True
+    is_query = document.definitions[0].operation == OperationType.QUERY
+    return is_query and isinstance(exception, httpx.RemoteProtocolError)
+
+
+def _error(exception):
+    return BuycoinsException(f'The request to the Buycoins API failed: {exception!r}')
+
+
+class HTTP2Transport:
+    """Synchronous HTTP/2 transport, safe to share between threads."""
+
+    def __init__(self, url, headers, **kwargs):
+        """
+        Constructor for the HTTP2Transport Class
+
+        :param url: (``str``) The GraphQL endpoint.
+        :param headers: (``dict``) Headers sent with every request.
+        :param kwargs: Extra arguments passed to ``httpx.Client``.
+        """
+        if httpx is None:
+            raise BuycoinsException(INSTALL_HINT)
+        self.url = url
+        self.client = _client(httpx.Client, headers, kwargs)
+
+    def execute(self, document, variables=None):
+        """
+        Execute ``document`` and return its ``data``.
+
+        :param document: (``DocumentNode``)
+        :param variables: (``dict``, optional)
+        :return: (``dict``)
+        """
+        payload = _payload(document, variables)
+        for retry in (False, True):
+            try:
+                response = self.client.post(self.url, json=payload)
+                break
+            except httpx.HTTPError as exception:
+                if retry or not _retryable(exception, document):
+                    raise _error(exception) from exception
+        return _result(response)
+
+    def close(self):
+        self.client.close()
+
+
+class AsyncHTTP2Transport:
+    """Asynchronous HTTP/2 transport for use with :class:`buycoins.api.AsyncAPI`."""
+
+    def __init__(self, url, headers, **kwargs):
+        """
+        Constructor for the AsyncHTTP2Transport Class
+
+        :param url: (``str``) The GraphQL endpoint.
+        :param headers: (``dict``) Headers sent with every request.
+        :param kwargs: Extra arguments passed to ``httpx.AsyncClient``.
+        """
+        if httpx is None:
+            raise BuycoinsException(INSTALL_HINT)
+        self.url = url
+        self.client = _client(httpx.AsyncClient, headers, kwargs)
+
+    async def execute(self, document, variables=None):
+        """
+        Execute ``document`` and return its ``data``.
+
+        :param document: (``DocumentNode``)
+        :param variables: (``dict``, optional)
+        :return: (``dict``)
+        """
+        payload = _payload(document, variables)
+        for retry in (False, True):
+            try:
+                response = await self.client.post(self.url, json=payload)
+                break
+            except httpx.HTTPError as exception:
+                if retry or not _retryable(exception, document):
+                    raise _error(exception) from exception
+        return _result(response)
+
+    async def close(self):
+        await self.client.aclose()
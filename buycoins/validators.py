@@ -0,0 +1,233 @@
+# Buycoin Python SDK
+# Copyright 2021 Iyanuoluwa Ajao
+# See LICENCE for details.
+
+"""
+Local validation of GraphQL variables.
+
+Validators are built once per operation from the variable definitions declared in
+:mod:`buycoins.queries` and :mod:`buycoins.mutations`, so that a bad request is rejected
+before it reaches the network or uses any of the rate limit budget.
+
+>>> from buycoins.mutations import SEND
+>>> get_validator(SEND)({'amount': 0.01, 'address': '1MmyYvSEYLCPm45Ps6vQin1heGBv3UpNbf'})
+"""
+
+import re
+import threading
+from decimal import Decimal, InvalidOperation
+
+from graphql import GraphQLEnumType
+from graphql.language import ListTypeNode, NonNullTypeNode
+
+from buycoins.exceptions import ValidationException
+
+
+MAX_DECIMAL_PLACES = 18
+MAX_VALIDATORS = 256
+
+DECIMAL_PATTERN = re.compile(r'-?\d+(\.\d+)?([eE][-+]?\d+)?')
+
+ENUMS = {
+    'OrderSide': frozenset(['buy', 'sell']),
+    'Cryptocurrency': frozenset(['bitcoin', 'ethereum', 'litecoin', 'naira_token', 'usd_coin', 'usd_tether']),
+    'PriceType': frozenset(['static', 'dynamic']),
+    'GetOrdersStatus': frozenset(['open', 'completed']),
+}
+
+_validators = {}
+_validators_lock = threading.Lock()
+
+# Checkers take the variable name, its value and the schema, if one has been fetched.
+
+
+def _check_string(name, value, schema):
+    if not isinstance(value, str):
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+    return value
+
+
+def _check_id(name, value, schema):
+    if isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+    return value
+
+
+def _check_int(name, value, schema):
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+    return value
+
+
+def _check_float(name, value, schema):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+    return value
+
+
+def _check_boolean(name, value, schema):
+    if not isinstance(value, bool):
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+    return value
+
+
+def _check_big_decimal(name, value, schema):
+    """
+    Accept positive ``int``, ``float``, ``Decimal`` and numeric ``str`` amounts.
+
+    Every ``BigDecimal`` the API takes is an amount or a price, so zero and negative values are rejected. The
+    normalised value is sent as a string.
+    """
+    if isinstance(value, bool) or not isinstance(value, (int, float, Decimal, str)):
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+
+    # Decimal() also parses whitespace, underscores and 'NaN', none of which the server accepts.
+    if isinstance(value, str) and not DECIMAL_PATTERN.fullmatch(value):
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+
+    try:
+        number = Decimal(str(value)) if isinstance(value, float) else Decimal(value)
+    except InvalidOperation:
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+
+    if not number.is_finite():
+        raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.", variable=name, value=value)
+
+    if number <= 0:
+        raise ValidationException(f"The '{name}' parameter must be positive, got '{value}'.",
+                                  variable=name, value=value)
+
+    if -number.as_tuple().exponent > MAX_DECIMAL_PLACES:
+        raise ValidationException(f"The '{name}' parameter has more than {MAX_DECIMAL_PLACES} decimal places.",
+                                  variable=name, value=value)
+
+    return format(number, 'f')
+
+
+def _named_checker(type_name):
+    """
+    Check enums against the schema's values when a schema is available, and against ``ENUMS`` otherwise.
+
+    Input objects and unknown types are left for the server to validate.
+    """
+    def check(name, value, schema):
+        schema_type = schema.get_type(type_name) if schema is not None else None
+        if isinstance(schema_type, GraphQLEnumType):
+            allowed = schema_type.values
+        elif schema_type is None:
+            allowed = ENUMS.get(type_name)
+        else:
+            allowed = None
+
+        if allowed is not None and value not in allowed:
+            raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.",
+                                      variable=name, value=value)
+        return value
+    return check
+
+
+def _list_checker(check_item, item_required):
+    def check(name, value, schema):
+        if not isinstance(value, (list, tuple)):
+            raise ValidationException(f"The '{name}' parameter has a wrong value '{value}'.",
+                                      variable=name, value=value)
+        items = []
+        for item in value:
+            if item is None:
+                if item_required:
+                    raise ValidationException(f"The '{name}' parameter must not contain null values.",
+                                              variable=name, value=value)
+                items.append(item)
+            else:
+                items.append(check_item(name, item, schema))
+        return items
+    return check
+
+
+SCALARS = {
+    'String': _check_string,
+    'ID': _check_id,
+    'Int': _check_int,
+    'Float': _check_float,
+    'Boolean': _check_boolean,
+    'BigDecimal': _check_big_decimal,
+}
+
+
+def _build_checker(type_node):
+    """Return ``(required, checker)`` for a variable type node."""
+    required = isinstance(type_node, NonNullTypeNode)
+    if required:
+        type_node = type_node.type
+
+    if isinstance(type_node, ListTypeNode):
+        item_required, check_item = _build_checker(type_node.type)
+        return required, _list_checker(check_item, item_required)
+
+    type_name = type_node.name.value
+    if type_name in SCALARS:
+        return required, SCALARS[type_name]
+
+    return required, _named_checker(type_name)
+
+
+class Validator:
+    """Validates the variables of a single GraphQL operation."""
+
+    def __init__(self, document):
+        """
+        Constructor for the Validator Class
+
+        :param document: (``DocumentNode``) A document created with ``gql``.
+        """
+        self.document = document
+        self.checkers = {}
+        for definition in document.definitions:
+            for variable_definition in getattr(definition, 'variable_definitions', None) or ():
+                name = variable_definition.variable.name.value
+                self.checkers[name] = _build_checker(variable_definition.type)
+
+    def __call__(self, params, schema=None):
+        """
+        Validate ``params`` and return the variables to send.
+
+        Optional variables whose value is ``None`` are left out rather than sent as ``null``, so the server's
+        argument defaults still apply.
+
+        :param params: (``dict``) Variable values keyed by variable name.
+        :param schema: (``GraphQLSchema``, optional) Used to look up enum values when available.
+        :return: (``dict``)
+        """
+        checkers = self.checkers
+        for name in params:
+            if name not in checkers:
+                raise ValidationException(f"The '{name}' parameter is not declared by the operation.",
+                                          variable=name, value=params[name])
+
+        variables = {}
+        for name, (required, check) in checkers.items():
+            value = params.get(name)
+            if value is None:
+                if required:
+                    raise ValidationException(f"The '{name}' parameter is required.", variable=name)
+                continue
+            variables[name] = check(name, value, schema)
+        return variables
+
+
+def get_validator(document):
+    """
+    Return the cached :class:`Validator` for ``document``.
+
+    :param document: (``DocumentNode``) A document created with ``gql``.
+    :return: (:class:`Validator`)
+    """
+    validator = _validators.get(id(document))
+    if validator is None:
+        validator = Validator(document)
+        with _validators_lock:
+            if len(_validators) >= MAX_VALIDATORS:
+                _validators.pop(next(iter(_validators)))
+            # The validator keeps a reference to the document so its id is not reused.
+            _validators[id(document)] = validator
+    return validator
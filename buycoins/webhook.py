@@ -1,5 +1,8 @@
 import hashlib
 import hmac
+import json
+
+from buycoins.exceptions import BuycoinsException
 
 
 def verify_payload(body, webhook_token, header_signature):
@@ -15,4 +18,20 @@ def verify_payload(body, webhook_token, header_signature):
         body = bytes(body)
 
     hashed = hmac.new(signing_key, body, hashlib.sha1)
-    return hashed.hexdigest() == header_signature
+    expected = hashed.hexdigest().encode("utf-8")
+    return hmac.compare_digest(expected, (header_signature or "").encode("utf-8"))
+
+
+def parse_event(body, webhook_token, header_signature):
+    """
+    Verify a webhook request and return its event payload.
+
+    :param body: (``bytes``) The raw request body.
+    :param webhook_token: (``str``) Your webhook token.
+    :param header_signature: (``str``) The value of the ``X-Webhook-Signature`` header.
+    :return: (``dict``) The ``payload`` of the webhook, with ``event`` and ``data`` keys.
+    """
+    if not verify_payload(body, webhook_token, header_signature):
+        raise BuycoinsException('The webhook signature is not valid.')
+
+    return json.loads(body)['payload']
@@ -0,0 +1,166 @@
+import hashlib
+import hmac
+import json
+import threading
+import time
+import unittest
+from decimal import Decimal
+
+from buycoins.exceptions import BuycoinsException
+from buycoins.ledger import BalanceLedger
+
+
+class FakeAPI:
+
+    def __init__(self, bitcoin='1.5', naira='1000'):
+        self.bitcoin = bitcoin
+        self.naira = naira
+        self.calls = 0
+        self.delay = 0
+        self.during_fetch = None
+
+    def get_balances(self):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.during_fetch is not None:
+            during_fetch, self.during_fetch = self.during_fetch, None
+            during_fetch()
+        return {'getBalances': [
+            {'id': '1', 'cryptocurrency': 'bitcoin', 'confirmedBalance': self.bitcoin},
+            {'id': '2', 'cryptocurrency': 'naira_token', 'confirmedBalance': self.naira},
+        ]}
+
+
+def send_result(id='send-1', amount='0.1', fee='0.001'):
+    return {'send': {'id': id, 'cryptocurrency': 'bitcoin', 'status': 'pending', 'amount': amount, 'fee': fee}}
+
+
+def incoming(id, status, amount='2', cryptocurrency='ethereum'):
+    return {'event': 'coins.incoming',
+            'data': {'id': id, 'cryptocurrency': cryptocurrency, 'amount': amount, 'status': status}}
+
+
+class BalanceLedgerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = FakeAPI()
+        self.ledger = BalanceLedger(self.api)
+
+    def test_seeded_from_get_balances(self):
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('1.5'))
+        self.assertEqual(self.ledger.balance('litecoin'), Decimal(0))
+        self.assertTrue(self.ledger.has(1000, 'naira_token'))
+        self.assertEqual(self.api.calls, 1)
+
+    def test_send_is_applied_locally(self):
+        self.ledger.apply_result(send_result())
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('1.399'))
+        self.assertFalse(self.ledger.drifted)
+        self.assertEqual(self.api.calls, 1)
+
+    def test_duplicate_results_are_ignored(self):
+        self.ledger.apply_result(send_result())
+        self.ledger.apply_result(send_result())
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('1.399'))
+
+    def test_buys_do_not_poll(self):
+        for index in range(5):
+            self.ledger.apply_result({'buy': {'id': f'b{index}', 'cryptocurrency': 'bitcoin', 'status': 'processing',
+                                              'totalCoinAmount': '0.1'}})
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('2.0'))
+        self.assertEqual(self.api.calls, 1)
+
+    def test_buy_reconciles_naira_on_next_read(self):
+        self.api.naira = '0'
+        self.ledger.apply_result({'buy': {'id': 'b', 'cryptocurrency': 'bitcoin', 'status': 'processing',
+                                          'totalCoinAmount': '0.5'}})
+        self.assertEqual(self.api.calls, 1)
+        self.assertFalse(self.ledger.has(1000, 'naira_token'))
+        self.assertFalse(self.ledger.has(1000, 'naira_token'))
+        self.assertEqual(self.api.calls, 2)
+
+    def test_orders_mark_naira_stale(self):
+        for side in ('buy', 'sell'):
+            self.ledger.apply_result({'postLimitOrder': {'id': side, 'cryptocurrency': 'bitcoin', 'side': side,
+                                                         'coinAmount': '0.1', 'status': 'active'}})
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('1.4'))
+        self.assertEqual(self.api.calls, 1)
+        self.ledger.balance('naira_token')
+        self.assertEqual(self.api.calls, 2)
+
+    def test_missing_fields_mark_drift(self):
+        self.api.bitcoin = '1.2'
+        self.ledger.apply_result({'buy': {'id': 'b'}})
+        self.ledger.apply_result({'send': {'id': 's', 'cryptocurrency': 'bitcoin', 'amount': '0.1'}})
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('1.2'))
+        self.assertEqual(self.api.calls, 3)
+
+    def test_negative_balance_marks_drift(self):
+        self.api.bitcoin = '3'
+        self.ledger.apply_result(send_result(amount='5'))
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('3'))
+        self.assertFalse(self.ledger.drifted)
+        self.assertEqual(self.api.calls, 2)
+
+    def test_pending_event_does_not_hide_success(self):
+        self.ledger.apply_event(incoming('e1', 'pending'))
+        self.assertEqual(self.ledger.balance('ethereum'), Decimal(0))
+        self.ledger.apply_event(incoming('e1', 'success'))
+        self.ledger.apply_event(incoming('e1', 'success'))
+        self.assertEqual(self.ledger.balance('ethereum'), Decimal('2'))
+
+    def test_unknown_event_marks_drift(self):
+        self.ledger.apply_event({'event': 'coins.outgoing', 'data': {'id': 'x'}})
+        self.assertEqual(self.api.calls, 2)
+
+    def test_reconcile_keeps_balances_changed_during_fetch(self):
+        self.api.during_fetch = lambda: self.ledger.apply_result(send_result())
+        self.api.bitcoin, self.api.naira = '9', '500'
+        self.ledger.reconcile()
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('1.399'))
+        self.assertEqual(self.ledger.balance('naira_token'), Decimal('500'))
+        self.assertFalse(self.ledger.drifted)
+        self.ledger.reconcile()
+        self.assertEqual(self.ledger.balance('bitcoin'), Decimal('9'))
+
+    def test_naira_marked_stale_during_fetch_stays_stale(self):
+        self.api.during_fetch = lambda: self.ledger.apply_result({'buy': {
+            'id': 'b', 'cryptocurrency': 'bitcoin', 'status': 'processing', 'totalCoinAmount': '0.1'}})
+        self.ledger.reconcile()
+        self.assertEqual(self.api.calls, 2)
+        self.ledger.balance('naira_token')
+        self.assertEqual(self.api.calls, 3)
+
+    def test_concurrent_reconciles_make_one_call(self):
+        self.api.delay = 0.05
+        self.ledger.drifted = True
+        barrier = threading.Barrier(10)
+
+        def read():
+            barrier.wait()
+            self.ledger.reconcile_if_needed()
+
+        threads = [threading.Thread(target=read) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.api.calls, 2)
+
+    def test_reconcile_interval(self):
+        self.ledger.reconcile_interval = 0
+        self.ledger.apply_result(send_result())
+        self.assertEqual(self.api.calls, 2)
+
+    def test_apply_webhook(self):
+        body = json.dumps({'hook_id': 1, 'payload': incoming('w1', 'success')}).encode('utf-8')
+        signature = hmac.new(b'token', body, hashlib.sha1).hexdigest()
+        self.ledger.apply_webhook(body, 'token', signature)
+        self.assertEqual(self.ledger.balance('ethereum'), Decimal('2'))
+        for signature in ['bad', None, 'é']:
+            with self.assertRaises(BuycoinsException):
+                self.ledger.apply_webhook(body, 'token', signature)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest import mock
+
+from graphql import print_ast
+
+from buycoins import projection
+from buycoins.api import API
+from buycoins.exceptions import BuycoinsException
+from buycoins.mutations import BUY, SEND
+from buycoins.projection import project
+from buycoins.queries import CURRENT_GET_PRICES, GET_MARKET_BOOK, GET_PRICES
+
+
+MARKET_BOOK = '''{
+  getMarketBook {
+    dynamicPriceExpiry
+    orders {
+      edges {
+        node {
+          coinAmount
+          pricePerCoin
+          side
+        }
+      }
+    }
+  }
+}'''
+
+SEND_TRANSACTION = '''mutation send($amount: BigDecimal!, $cryptocurrency: Cryptocurrency, $address: String!) {
+  send(cryptocurrency: $cryptocurrency, amount: $amount, address: $address) {
+    id
+    transaction {
+      txhash
+      id
+    }
+  }
+}'''
+
+
+class ProjectionTestCase(unittest.TestCase):
+
+    def test_projects_connection_nodes(self):
+        self.assertEqual(print_ast(project(GET_MARKET_BOOK, ['pricePerCoin', 'coinAmount', 'side'])), MARKET_BOOK)
+
+    def test_keeps_object_fields_whole(self):
+        self.assertEqual(print_ast(project(SEND, ['transaction', 'id'])), SEND_TRANSACTION)
+
+    def test_original_document_is_unchanged(self):
+        before = print_ast(GET_MARKET_BOOK)
+        project(GET_MARKET_BOOK, ['side'])
+        self.assertEqual(print_ast(GET_MARKET_BOOK), before)
+
+    def test_full_and_none(self):
+        self.assertIs(project(GET_MARKET_BOOK), GET_MARKET_BOOK)
+        self.assertIs(project(GET_MARKET_BOOK, 'full'), GET_MARKET_BOOK)
+
+    def test_minimal_prices_keep_limits(self):
+        printed = print_ast(project(GET_PRICES, 'minimal'))
+        for field in ['id', 'minBuy', 'maxBuy', 'minSell', 'maxSell', 'minCoinAmount', 'expiresAt']:
+            self.assertIn(field, printed)
+        self.assertIn('minBuy', print_ast(project(CURRENT_GET_PRICES, 'minimal')))
+
+    def test_cache_key_ignores_order_and_type(self):
+        projected = project(BUY, ['status', 'id'])
+        self.assertIs(project(BUY, {'id', 'status'}), projected)
+        self.assertIs(project(BUY, ('id', 'status')), projected)
+
+    def test_cache_is_bounded(self):
+        with mock.patch.object(projection, 'MAX_PROJECTIONS', 2), mock.patch.dict(projection._projections, clear=True):
+            project(BUY, ['id'])
+            project(BUY, ['status'])
+            project(BUY, ['side'])
+            self.assertEqual(len(projection._projections), 2)
+
+    def test_errors(self):
+        for fields in [['nope'], [], 'tiny']:
+            with self.assertRaises(BuycoinsException):
+                project(BUY, fields)
+
+    def test_api_methods_accept_fields(self):
+        api = API('public', 'secret')
+        with mock.patch.object(API, '_execute', side_effect=lambda query, variables: print_ast(query)):
+            self.assertEqual(api.get_market_book(fields=['side', 'pricePerCoin', 'coinAmount']), MARKET_BOOK)
+            with self.assertRaises(BuycoinsException):
+                api.get_market_book(fields=['nope'])
+
+
+if __name__ == '__main__':
+    unittest.main()
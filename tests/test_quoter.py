@@ -0,0 +1,108 @@
+import threading
+import time
+import unittest
+from decimal import Decimal
+
+from buycoins.exceptions import BuycoinsException
+from buycoins.quoter import Quoter
+
+
+class FakeAPI:
+
+    def __init__(self, expires_in=60, delay=0):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.price_calls = 0
+        self.fee_calls = 0
+        self.bought = []
+
+    def get_prices(self):
+        self.price_calls += 1
+        time.sleep(self.delay)
+        return {'getPrices': [{
+            'id': f'price-{self.price_calls}', 'cryptocurrency': 'bitcoin',
+            'buyPricePerCoin': '100.5', 'sellPricePerCoin': 99.5,
+            'minBuy': '0.001', 'maxBuy': '1', 'minSell': '0.001', 'maxSell': '2', 'minCoinAmount': '0.001',
+            'expiresAt': time.time() + self.expires_in,
+        }, {
+            'id': 'usd-coin', 'cryptocurrency': 'usd_coin', 'buyPricePerCoin': '500', 'sellPricePerCoin': '490',
+        }]}
+
+    def get_estimated_network_fee(self, amount, cryptocurrency):
+        self.fee_calls += 1
+        return {'getEstimatedNetworkFee': {'estimatedFee': '0.0001', 'total': str(amount)}}
+
+    def buy(self, price, coin_amount, cryptocurrency):
+        self.bought.append((price, coin_amount, cryptocurrency))
+        return {'buy': {'id': 'order'}}
+
+
+class QuoterTestCase(unittest.TestCase):
+
+    def test_quote_buy_uses_cached_price(self):
+        api = FakeAPI()
+        quoter = Quoter(api)
+        quote = quoter.quote_buy(0.1)
+        self.assertEqual(quote.price_id, 'price-1')
+        self.assertEqual(quote.total, Decimal('10.05'))
+        quoter.quote_sell('1')
+        self.assertEqual(api.price_calls, 1)
+
+    def test_buy_passes_price_id(self):
+        api = FakeAPI()
+        Quoter(api).buy('0.5')
+        self.assertEqual(api.bought, [('price-1', Decimal('0.5'), 'bitcoin')])
+
+    def test_refreshes_price_about_to_expire(self):
+        api = FakeAPI(expires_in=3)
+        quoter = Quoter(api, expiry_margin=5)
+        self.assertEqual(quoter.quote_buy(0.1).price_id, 'price-1')
+        self.assertEqual(quoter.quote_buy(0.1).price_id, 'price-2')
+
+    def test_limits(self):
+        quoter = Quoter(FakeAPI())
+        with self.assertRaises(BuycoinsException):
+            quoter.quote_buy('5')
+        with self.assertRaises(BuycoinsException):
+            quoter.quote_buy('0.0001')
+        quoter.quote_sell('2')
+
+    def test_rejects_malformed_and_non_positive_amounts(self):
+        quoter = Quoter(FakeAPI())
+        for amount in ['abc', None, [1], 'NaN', 0, '-1']:
+            with self.assertRaises(BuycoinsException):
+                quoter.quote_buy(amount, 'usd_coin')
+        with self.assertRaises(BuycoinsException):
+            quoter.quote_send(-1)
+
+    def test_unknown_cryptocurrency(self):
+        with self.assertRaises(BuycoinsException):
+            Quoter(FakeAPI()).quote_buy(1, 'litecoin')
+
+    def test_concurrent_cold_quotes_refresh_once(self):
+        api = FakeAPI(delay=0.05)
+        quoter = Quoter(api)
+        barrier = threading.Barrier(10)
+
+        def quote():
+            barrier.wait()
+            quoter.quote_buy(0.1)
+
+        threads = [threading.Thread(target=quote) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(api.price_calls, 1)
+
+    def test_quote_send_reuses_fee(self):
+        api = FakeAPI()
+        quoter = Quoter(api)
+        quote = quoter.quote_send('0.01')
+        self.assertEqual(quote.total, Decimal('0.0101'))
+        self.assertEqual(quoter.quote_send(1).fee, Decimal('0.0001'))
+        self.assertEqual(api.fee_calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
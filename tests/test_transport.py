@@ -0,0 +1,132 @@
+import asyncio
+import json
+import sys
+import unittest
+from unittest import mock
+
+import httpx
+from gql.transport.exceptions import TransportQueryError, TransportServerError
+
+from buycoins.api import API, AsyncAPI
+from buycoins.exceptions import BuycoinsException
+from buycoins.mutations import SEND
+from buycoins.queries import GET_BALANCES
+from buycoins.transport import AsyncHTTP2Transport, HTTP2Transport
+
+
+URL = 'https://backend.buycoins.tech/api'
+BALANCES = {'data': {'getBalances': [{'id': '1', 'cryptocurrency': 'bitcoin', 'confirmedBalance': '1.5'}]}}
+
+
+def handler(*responses):
+    """Return a handler that replays ``responses``, raising exceptions and recording the requests it gets."""
+    requests = []
+
+    def handle(request):
+        requests.append(request)
+        response = responses[len(requests) - 1]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    handle.requests = requests
+    return handle
+
+
+def transport(handle):
+    return HTTP2Transport(URL, headers={'Authorization': 'Basic abc'}, transport=httpx.MockTransport(handle))
+
+
+class HTTP2TransportTestCase(unittest.TestCase):
+
+    def test_returns_data(self):
+        handle = handler(httpx.Response(200, json=BALANCES))
+        data = transport(handle).execute(GET_BALANCES, {'cryptocurrency': 'bitcoin'})
+        self.assertEqual(data, BALANCES['data'])
+        request = handle.requests[0]
+        self.assertEqual(request.headers['authorization'], 'Basic abc')
+        self.assertEqual(json.loads(request.content)['variables'], {'cryptocurrency': 'bitcoin'})
+
+    def test_graphql_errors(self):
+        handle = handler(httpx.Response(200, json={'errors': [{'message': 'Invalid price'}], 'data': None}))
+        with self.assertRaises(TransportQueryError):
+            transport(handle).execute(GET_BALANCES)
+
+    def test_server_errors(self):
+        handle = handler(httpx.Response(502, text='Bad Gateway'))
+        with self.assertRaises(TransportServerError) as context:
+            transport(handle).execute(GET_BALANCES)
+        self.assertEqual(context.exception.code, 502)
+
+    def test_query_is_retried_once_when_the_connection_is_closed(self):
+        handle = handler(httpx.RemoteProtocolError('ConnectionTerminated'), httpx.Response(200, json=BALANCES))
+        self.assertEqual(transport(handle).execute(GET_BALANCES), BALANCES['data'])
+
+        handle = handler(httpx.RemoteProtocolError('ConnectionTerminated'),
+                         httpx.RemoteProtocolError('ConnectionTerminated'))
+        with self.assertRaises(BuycoinsException):
+            transport(handle).execute(GET_BALANCES)
+        self.assertEqual(len(handle.requests), 2)
+
+    def test_mutation_is_not_retried_when_the_connection_is_closed(self):
+        handle = handler(httpx.RemoteProtocolError('ConnectionTerminated'), httpx.Response(200, json={'data': {}}))
+        with self.assertRaises(BuycoinsException):
+            transport(handle).execute(SEND, {'amount': '1', 'address': 'x'})
+        self.assertEqual(len(handle.requests), 1)
+
+    def test_mutation_is_retried_when_it_could_not_connect(self):
+        handle = handler(httpx.ConnectError('refused'), httpx.Response(200, json={'data': {'send': None}}))
+        self.assertEqual(transport(handle).execute(SEND, {'amount': '1', 'address': 'x'}), {'send': None})
+
+    def test_other_errors_are_wrapped(self):
+        handle = handler(httpx.ReadTimeout('timed out'))
+        with self.assertRaises(BuycoinsException):
+            transport(handle).execute(GET_BALANCES)
+        self.assertEqual(len(handle.requests), 1)
+
+    def test_missing_h2(self):
+        with mock.patch.dict(sys.modules, {'h2': None}):
+            with self.assertRaises(BuycoinsException) as context:
+                HTTP2Transport(URL, headers={})
+        self.assertIn('httpx[http2,brotli]', str(context.exception))
+        self.assertIn('requirements-http2.txt', str(context.exception))
+
+
+class AsyncHTTP2TransportTestCase(unittest.TestCase):
+
+    def test_query_is_retried_once(self):
+        handle = handler(httpx.RemoteProtocolError('ConnectionTerminated'), httpx.Response(200, json=BALANCES))
+
+        async def execute():
+            async_transport = AsyncHTTP2Transport(URL, headers={}, transport=httpx.MockTransport(handle))
+            try:
+                return await async_transport.execute(GET_BALANCES)
+            finally:
+                await async_transport.close()
+
+        self.assertEqual(asyncio.run(execute()), BALANCES['data'])
+
+
+class APITransportTestCase(unittest.TestCase):
+
+    def test_api_over_http2(self):
+        api = API('public', 'secret', http2=True)
+        api.transport = transport(handler(httpx.Response(200, json=BALANCES)))
+        self.assertEqual(api.get_balances('bitcoin'), BALANCES['data'])
+
+    def test_async_api(self):
+        handle = handler(httpx.Response(200, json=BALANCES), httpx.Response(200, json=BALANCES))
+
+        async def execute():
+            api = AsyncAPI('public', 'secret')
+            api.transport = AsyncHTTP2Transport(URL, headers={}, transport=httpx.MockTransport(handle))
+            try:
+                return await asyncio.gather(api.get_balances(), api.get_balances('bitcoin'))
+            finally:
+                await api.close()
+
+        self.assertEqual(asyncio.run(execute()), [BALANCES['data'], BALANCES['data']])
+
+
+if __name__ == '__main__':
+    unittest.main()
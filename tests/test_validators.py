@@ -0,0 +1,127 @@
+import unittest
+from decimal import Decimal
+from unittest import mock
+
+from gql import gql
+from graphql import build_schema
+
+from buycoins.api import API
+from buycoins.exceptions import BuycoinsException, ValidationException
+from buycoins.mutations import BUY, POST_LIMIT_ORDER, SEND
+from buycoins.queries import GET_ESTIMATED_NETWORK_FEE, GET_ORDERS
+from buycoins import validators
+from buycoins.validators import Validator, get_validator
+
+
+class ValidatorTestCase(unittest.TestCase):
+
+    def test_accepts_every_amount_type(self):
+        validate = get_validator(GET_ESTIMATED_NETWORK_FEE)
+        for amount, sent in [(1, '1'), (0.01, '0.01'), (Decimal('0.001'), '0.001'), ('0.5', '0.5')]:
+            self.assertEqual(validate({'amount': amount})['amount'], sent)
+
+    def test_sends_normalised_amount(self):
+        variables = get_validator(GET_ESTIMATED_NETWORK_FEE)({'amount': '1.50e1'})
+        self.assertEqual(variables['amount'], '15.0')
+        variables = get_validator(GET_ESTIMATED_NETWORK_FEE)({'amount': Decimal('1E-7')})
+        self.assertEqual(variables['amount'], '0.0000001')
+
+    def test_rejects_bad_amounts(self):
+        validate = get_validator(GET_ESTIMATED_NETWORK_FEE)
+        for amount in [True, 'abc', ' 1 ', '1_0', 'NaN', '+1', float('nan'), Decimal('Infinity'), 0, -5, Decimal('1e-19'), [1]]:
+            with self.assertRaises(ValidationException) as context:
+                validate({'amount': amount})
+            self.assertEqual(context.exception.variable, 'amount')
+
+    def test_rejects_enum_values(self):
+        with self.assertRaises(ValidationException) as context:
+            get_validator(GET_ESTIMATED_NETWORK_FEE)({'amount': 1, 'cryptocurrency': 'dogecoin'})
+        self.assertEqual(context.exception.variable, 'cryptocurrency')
+        self.assertIsInstance(context.exception, BuycoinsException)
+
+    def test_required_variables(self):
+        with self.assertRaises(ValidationException):
+            get_validator(GET_ORDERS)({})
+        with self.assertRaises(ValidationException):
+            get_validator(SEND)({'amount': 1})
+
+    def test_rejects_undeclared_variables(self):
+        with self.assertRaises(ValidationException) as context:
+            get_validator(BUY)({'price': 'id', 'coin_amount': 1, 'coinAmount': 1})
+        self.assertEqual(context.exception.variable, 'coinAmount')
+
+    def test_optional_null_is_omitted(self):
+        variables = get_validator(POST_LIMIT_ORDER)({
+            'orderSide': 'buy', 'coinAmount': 1, 'priceType': 'static', 'staticPrice': 2, 'dynamicExchangeRate': None,
+        })
+        self.assertNotIn('dynamicExchangeRate', variables)
+        self.assertNotIn('cryptocurrency', variables)
+
+    def test_ids_accept_ints(self):
+        self.assertEqual(get_validator(BUY)({'price': 42, 'coin_amount': 1})['price'], 42)
+        with self.assertRaises(ValidationException):
+            get_validator(BUY)({'price': True, 'coin_amount': 1})
+
+    def test_schema_enum_values(self):
+        schema = build_schema('''
+            scalar BigDecimal
+            enum Cryptocurrency { bitcoin }
+            type Query { getEstimatedNetworkFee(cryptocurrency: Cryptocurrency, amount: BigDecimal!): String }
+        ''')
+        validate = Validator(GET_ESTIMATED_NETWORK_FEE)
+        validate({'amount': 1, 'cryptocurrency': 'bitcoin'}, schema)
+        with self.assertRaises(ValidationException):
+            validate({'amount': 1, 'cryptocurrency': 'ethereum'}, schema)
+        validate({'amount': 1, 'cryptocurrency': 'ethereum'})
+
+    def test_validators_are_cached(self):
+        self.assertIs(get_validator(SEND), get_validator(SEND))
+
+    def test_cache_is_bounded(self):
+        documents = [gql('query { getBalances { id } }') for _ in range(validators.MAX_VALIDATORS + 1)]
+        for document in documents:
+            get_validator(document)
+        self.assertLessEqual(len(validators._validators), validators.MAX_VALIDATORS)
+
+
+class APIValidationTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.api = API('public', 'secret')
+        patcher = mock.patch.object(API, '_execute', side_effect=lambda query, variables: variables)
+        self.execute = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_invalid_request_is_not_sent(self):
+        with self.assertRaises(ValidationException):
+            self.api.send(-1, '1MmyYvSEYLCPm45Ps6vQin1heGBv3UpNbf')
+        self.execute.assert_not_called()
+
+    def test_post_limit_order_sends_dynamic_exchange_rate(self):
+        variables = self.api.post_limit_order('sell', 0.1, 'dynamic', dynamic_exchange_rate=Decimal('1.5'))
+        self.assertEqual(variables['dynamicExchangeRate'], '1.5')
+        with self.assertRaises(BuycoinsException):
+            self.api.post_limit_order('sell', 0.1, 'dynamic')
+
+    def test_get_estimated_network_fee_accepts_int_and_decimal(self):
+        self.assertEqual(self.api.get_estimated_network_fee(1)['amount'], '1')
+        self.assertEqual(self.api.get_estimated_network_fee(Decimal('0.01'))['amount'], '0.01')
+
+    def test_get_orders_requires_status(self):
+        self.assertEqual(self.api.get_orders('open'), {'status': 'open'})
+        with self.assertRaises(ValidationException):
+            self.api.get_orders('closed')
+
+    def test_fetched_schema_is_used(self):
+        schema = build_schema('''
+            scalar BigDecimal
+            enum Cryptocurrency { bitcoin }
+            type Query { getEstimatedNetworkFee(cryptocurrency: Cryptocurrency, amount: BigDecimal!): String }
+        ''')
+        self.api.schema = schema
+        with self.assertRaises(ValidationException):
+            self.api.get_estimated_network_fee(1, 'ethereum')
+
+
+if __name__ == '__main__':
+    unittest.main()